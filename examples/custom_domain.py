@@ -11,6 +11,7 @@ from evasionpaths.plotting_tools import *
 from evasionpaths.motion_model import *
 from evasionpaths.time_stepping import *
 from numpy import arctan2
+from contextlib import nullcontext
 
 ## This is a sample script to show how to create animations using matplotlib.
 # In creating an animaiton, the timestepping must be done manually, and plotted
@@ -18,6 +19,9 @@ from numpy import arctan2
 # that the simulation object should be in the global namespace so that it saves
 # its state (i.e. not passed by value into the update function).
 
+# Random number generator shared by the custom boundary and motion model
+rng = np.random.default_rng()
+
 
 class myBoundary(Boundary):
     ## Initialize with dimension of desired boundary.
@@ -46,17 +50,18 @@ class myBoundary(Boundary):
     ## Generate points in counter-clockwise order.
     def generate_boundary_points(self) -> list:
         points = []
-        points.extend([(x, self.vy_min) for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # bottom
-        points.extend([(self.vx_max, y) for y in np.arange(self.vy_min, 0.999*self.vx_max, self.spacing)])  # right
-        points.extend([(self.x_max - x, self.vy_max) for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # top
-        points.extend([(self.vx_min, self.y_max - y) for y in np.arange(self.vy_min, 0.999*self.vy_max, self.spacing)])  # left
+        points.extend([(float(x), self.vy_min) for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # bottom
+        points.extend([(self.vx_max, float(y)) for y in np.arange(self.vy_min, 0.999*self.vy_max, self.spacing)])  # right
+        points.extend([(self.x_min + self.x_max - float(x), self.vy_max)
+                       for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # top
+        points.extend([(self.vx_min, self.y_min + self.y_max - float(y))
+                       for y in np.arange(self.vy_min, 0.999*self.vy_max, self.spacing)])  # left
         return points
 
     ## Generate points distributed randomly (uniformly) in the interior.
     def generate_interior_points(self, n_int_sensors: int) -> list:
-        rand_x = np.random.uniform(self.x_min, self.x_max, size=n_int_sensors)
-        rand_y = np.random.uniform(self.y_min, self.y_max, size=n_int_sensors)
-        return list(zip(rand_x, rand_y))
+        rand_pts = rng.uniform((self.x_min, self.y_min), (self.x_max, self.y_max), size=(n_int_sensors, 2))
+        return [tuple(pt) for pt in rand_pts.tolist()]
 
     ## Generate Points to plot domain boundary.
     def domain_boundary_points(self):
@@ -98,7 +103,7 @@ class myBoundary(Boundary):
 class myMotionModel(MotionModel):
     def __init__(self, dt, boundary, max_vel, n_int_sensors, sensing_radius, G):
         super().__init__(dt, boundary)
-        self.velocities = np.random.uniform(-max_vel, max_vel, (n_int_sensors, 2))
+        self.velocities = rng.uniform(-max_vel, max_vel, (n_int_sensors, 2))
         self.n_sensors = n_int_sensors
         self.boundary = boundary
         self.sensing_radius = sensing_radius
@@ -110,34 +115,35 @@ class myMotionModel(MotionModel):
 
 
     def reflect(self, old_pt, new_pt, index) -> tuple:
-        norm_v = norm(self.velocities[index])
+        norm_v = math.hypot(*self.velocities[index])
         theta = self.boundary.reflect_velocity(old_pt, new_pt)
-        self.velocities[index] = (norm_v*cos(theta), norm_v*sin(theta))
+        self.velocities[index] = (norm_v*math.cos(theta), norm_v*math.sin(theta))
         return self.boundary.reflect_point(old_pt, new_pt)
 
-    def gradient(self, xs, ys):
-        gradUx, gradUy = [0] * self.n_sensors, [0] * self.n_sensors
-        for i in range(0, self.n_sensors):
-            pairwise_dist = [norm((xs[i] - xs[j], ys[i] - ys[j])) for j in range(0, self.n_sensors)]
-            gradUx[i] = self.G * sum((xs[i] - xs[j]) / pairwise_dist[j] ** 3
-                                     for j in range(0, self.n_sensors) if pairwise_dist[j] < 2*sensing_radius and pairwise_dist[j]!=0)
-            gradUy[i] = self.G * sum((ys[i] - ys[j]) / pairwise_dist[j] ** 3
-                                     for j in range(0, self.n_sensors) if pairwise_dist[j] < 2*sensing_radius and pairwise_dist[j]!=0)
-        return array(gradUx), array(gradUy)
-
+    ## Compute the right hand side of the ODE in one pass.
+    # The pairwise forces are summed directly into the output array
+    # alongside the velocities instead of building the gradient separately
+    # and concatenating the pieces.
     def time_derivative(self, _, state):
         # ode solver gives us np array in the form [xvals | yvals | vxvals | vyvals]
-        # split into individual np array
-        split_state = [state[i:i + self.n_sensors] for i in range(0, len(state), self.n_sensors)]
-        gradU = self.gradient(split_state[0], split_state[1])
-
-        # Need to compute time derivative of each,
-        # I just have d(x, y)/dt = (vx, vy), d(vx, vy)/dt = (1, -1)
-        dxdt = split_state[2]
-        dydt = split_state[3]
-        dvxdt = -gradU[0]
-        dvydt = -gradU[1]
-        return np.concatenate([dxdt, dydt, dvxdt, dvydt])
+        n, G = self.n_sensors, self.G
+        cutoff2 = (2 * self.sensing_radius) ** 2
+        xs, ys = state[:n], state[n:2 * n]
+
+        # Pairwise displacements, only sensors within 2*sensing_radius interact
+        dx = xs[:, None] - xs[None, :]
+        dy = ys[:, None] - ys[None, :]
+        dist2 = dx * dx + dy * dy
+        near = (dist2 != 0) & (dist2 < cutoff2)
+        inv_dist3 = np.zeros_like(dist2)
+        inv_dist3[near] = 1 / (dist2[near] * np.sqrt(dist2[near]))
+
+        # d(x, y)/dt = (vx, vy), d(vx, vy)/dt = -grad(U)
+        dstate = np.empty_like(state)
+        dstate[:2 * n] = state[2 * n:]
+        dstate[2 * n:3 * n] = -G * (dx * inv_dist3).sum(axis=1)
+        dstate[3 * n:] = -G * (dy * inv_dist3).sum(axis=1)
+        return dstate
 
     def update_points(self, old_points, dt) -> list:
         self.dt = dt
@@ -178,6 +184,12 @@ timestep_size = 0.01
 
 filename_base = "SampleAnimation"
 
+# Set to True to write the simulation time of every frame to filename_base.log
+log_steps = False
+
+# Set to True to save the animation to filename_base.mp4 instead of showing it
+save_animation = False
+
 unit_square = myBoundary(spacing=sensing_radius)
 
 n_body_model = myMotionModel(dt=timestep_size, boundary=unit_square, max_vel=1, n_int_sensors=num_sensors, sensing_radius=sensing_radius, G=1)
@@ -189,39 +201,50 @@ simulation = EvasionPathSimulation(boundary=unit_square,
                                    dt=timestep_size)
 
 
-# raise exception if simulation is over to kill animation.
+# raise exception if simulation is over to end a saved animation.
 class SimulationOver(Exception):
     pass
 
 
+# The figure and the artists showing the state are created once, and update()
+# replaces their data each frame instead of clearing and redrawing the axis.
+fig = plt.figure(1)
+axis = plt.gca()
+axis.axis("off")
+axis.axis("equal")
+show_domain_boundary(simulation)
+time_label = axis.text(0, 1, "", transform=axis.transAxes, va="top")
+state_artists = init_state_artists(simulation)
+
+
+# Return the artists to draw before the first frame
+def init():
+    return state_artists + (time_label,)
+
+
 # Update takes the frame number as an argument by default, other arguments
-# can be added by specifying fargs= ... in the FuncAnimation parameters
-def update(_):
+# can be added by specifying fargs= ... in the FuncAnimation parameters.
+# The log file is opened once in animate() and passed in with fargs, along
+# with the function that ends the animation once the simulation is over.
+def update(_, log_file, stop_animation):
 
     # Check is simulation is over
     if not simulation.cycle_label.has_intruder():
-        raise SimulationOver
+        stop_animation()
+        return state_artists + (time_label,)
 
     # Update simulation
     simulation.do_timestep()
     simulation.time += simulation.dt
 
-    # Setup figure
-    axis = plt.gca()
-    axis.cla()
-    axis.axis("off")
-    axis.axis("equal")
-    title_str = "T = " + "{:5.2f}:\n".format(simulation.time)
-    axis.set_title(title_str, loc="left")
+    # log the steps that were taken
+    if log_file is not None:
+        log_file.write("{0:5.2f}\n".format(simulation.time))
 
-    # plot
-    show_state(simulation)
+    # Update plot data
+    time_label.set_text("T = " + "{:5.2f}:".format(simulation.time))
+    return update_state_artists(simulation, state_artists) + (time_label,)
 
-"""
-    # log the steps that were taken
-    with open(filename_base+".log", "a+") as file:
-        file.write("{0:5.2f}\n".format(simulation.time))
-"""
 
 # Animation driver
 def animate():
@@ -232,20 +255,25 @@ def animate():
     # milliseconds per frame in resulting mp4 file
     ms_per_frame = 2000*timestep_size
 
-    fig = plt.figure(1)
-    ani = FuncAnimation(fig, update, interval=ms_per_frame, frames=n_steps)
-    plt.show()
-
-    # Uncomment below to save animations
-    """
-    try:
-        ani = FuncAnimation(fig, update, interval=ms_per_frame, frames=n_steps)
-    except SimulationOver:
-        print("Simulation Complete")
-    finally:
-        plt.show()  # show plot while computing
-        ani.save(filename_base+'.mp4')
-    """
+    # A shown animation is driven by a timer, which is stopped when the simulation
+    # is over. save() draws the frames itself, so it is ended with SimulationOver.
+    def stop_animation():
+        if save_animation:
+            raise SimulationOver
+        ani.event_source.stop()
+
+    with open(filename_base+".log", "a") if log_steps else nullcontext() as log_file:
+        ani = FuncAnimation(fig, update, fargs=(log_file, stop_animation), init_func=init,
+                            interval=ms_per_frame, frames=n_steps, blit=True, cache_frame_data=False)
+
+        if not save_animation:
+            plt.show()
+            return
+
+        try:
+            ani.save(filename_base+'.mp4')
+        except SimulationOver:
+            print("Simulation Complete")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
 # Kyle Williams 3/5/20
 import os
 from evasionpaths.time_stepping import *
-from joblib import Parallel, delayed
-import signal
+from multiprocessing import Pool, TimeoutError
+from typing import Iterable
 
 ## In cases where it is unknown whether a simulation will terminate or not, you may
 # want to set a timer on the simulation so it won't run longer that a set amount of time.
@@ -14,36 +14,38 @@ timestep_size: float = 0.01
 
 unit_square: Boundary = RectangularDomain(spacing=sensing_radius)
 
-# noinspection PyTypeChecker
-billiard: MotionModel = BilliardMotion(dt=timestep_size, boundary=unit_square, vel=1, n_int_sensors=num_sensors)
+
+# The motion model draws its random initial velocities when it is created,
+# so each run creates its own after seeding instead of sharing one
+def billiard() -> MotionModel:
+    return BilliardMotion(dt=timestep_size, boundary=unit_square, vel=1, n_int_sensors=num_sensors)
+
 
 output_dir: str = "./output"
 filename_base: str = "data"
 
 n_runs: int = 1000
 max_time: int = 600  # time in seconds
-
-class TimedOutExc(Exception):
-    pass
-
-
-def handler(signum, frame):
-    raise TimedOutExc
+grace_time: int = 60  # extra seconds the parent waits for a time step that is still running
 
 
-def simulate() -> float:
+# Forked workers inherit the same random state, so every run seeds it from its own child seed
+# before creating its sensors and motion model
+def simulate(seed: np.random.SeedSequence) -> float:
+    np.random.seed(seed.generate_state(4))
 
     simulation = EvasionPathSimulation(boundary=unit_square,
-                                       motion_model=billiard,
+                                       motion_model=billiard(),
                                        n_int_sensors=num_sensors,
                                        sensing_radius=sensing_radius,
                                        dt=timestep_size)
 
     try:
-        signal.signal(signal.SIGALRM, handler)
-        signal.alarm(max_time)
-        simulation.run()
-        data = simulation.time
+        data = simulation.run(timeout=max_time)
+
+    # Simulation ran longer than max_time seconds
+    except TimedOut as e:
+        data = str(e)
 
     # Error from two changes happening simultaneously
     except MaxRecursionDepth as e:
@@ -61,27 +63,43 @@ def simulate() -> float:
     # Catch all other errors
     except Exception as e:
         data = str(e)
-    finally:
-        signal.alarm(0)
     return data
 
 
-def output_data(filename: str, data_points: list) -> None:
-    with open(filename, 'a+') as file:
-        file.writelines("%.2f\n" % d for d in data_points)
+## Append each result to the file as it arrives.
+# data_points may be a generator, so results are written while other
+# simulations are still running.
+def output_data(filename: str, data_points: Iterable) -> None:
+    with open(filename, 'a') as file:
+        for d in data_points:
+            file.write(d + "\n" if isinstance(d, str) else "%.2f\n" % d)
+
+
+## Yield results as they arrive, giving up if none arrive in time.
+# run(timeout=max_time) only stops a simulation between time steps. Unless a
+# single time step hangs, every running simulation finishes within max_time
+# of the previous result, so if nothing arrives within max_time + grace_time
+# the remaining runs are recorded as timed out.
+def collect_results(results, n_results: int) -> Iterable:
+    for n in range(n_results):
+        try:
+            yield results.next(timeout=max_time + grace_time)
+        except TimeoutError:
+            yield from ["Timed out after " + str(max_time + grace_time) + "s"] * (n_results - n)
+            return
 
 
 def run_experiment() -> None:
-    times = Parallel(n_jobs=-1)(
-        delayed(simulate)() for _ in range(n_runs)
-    )
     filename = output_dir + "/" + filename_base + ".txt"
-    output_data(filename, times)
+
+    # Leaving the pool terminates any worker still stuck in a time step
+    with Pool() as pool:
+        seeds = np.random.SeedSequence().spawn(n_runs)
+        output_data(filename, collect_results(pool.imap_unordered(simulate, seeds), n_runs))
 
 
 def main() -> None:
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
     run_experiment()
 
@@ -6,7 +6,8 @@ import os, sys
 # sys.path.append(src_dir)
 
 from evasionpaths.time_stepping import *
-from joblib import Parallel, delayed
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable
 
 
 ############################################################
@@ -23,23 +24,33 @@ my_boundary = unit_square
 
 ############################################################
 # Define the motion model -- see src/motion_model.py for more details
-billiard: MotionModel = BilliardMotion(dt=timestep_size, 
-                                       boundary=my_boundary, 
-                                       vel=1, 
-                                       n_int_sensors=num_sensors)
+# - Motion models draw their random initial velocities when they are created,
+#   so each run creates its own after seeding instead of sharing one
+def billiard() -> MotionModel:
+    return BilliardMotion(dt=timestep_size,
+                          boundary=my_boundary,
+                          vel=1,
+                          n_int_sensors=num_sensors)
+
 
 # See the paper for the Dorsogna model to better understand the parameters
 dorsogna_coeff = {"Ca": 0.45, "la": 1, "Cr": 0.5, "lr": 0.1}
-dorsogna: MotionModel = Dorsogna(dt=timestep_size, 
-                                 boundary=my_boundary, 
-                                 max_vel=1, 
-                                 n_int_sensors=num_sensors, 
-                                 sensing_radius=sensing_radius, 
-                                 DO_coeff=dorsogna_coeff)
 
-brownian: MotionModel = BrownianMotion(dt=timestep_size,
-                                        boundary=my_boundary,
-                                        sigma=0.5)
+
+def dorsogna() -> MotionModel:
+    return Dorsogna(dt=timestep_size,
+                    boundary=my_boundary,
+                    max_vel=1,
+                    n_int_sensors=num_sensors,
+                    sensing_radius=sensing_radius,
+                    DO_coeff=dorsogna_coeff)
+
+
+def brownian() -> MotionModel:
+    return BrownianMotion(dt=timestep_size,
+                          boundary=my_boundary,
+                          sigma=0.5)
+
 
 ##############################
 # ASSIGN MOTION MODEL HERE
@@ -58,11 +69,20 @@ filename_base: str = "data"
 ############################################################
 # Run the simulation
 # - Unlike the animation, each simulation needs to create its own simulation object
-# - The number of simulations that will be run at one time is defined by n_jobs. n_jobs=-1 will run as many as possible. 
-def simulate() -> float:
+# - One simulation is run at a time on each worker process, by default there is one worker per CPU
+# - The boundary and motion model are sent to each worker once when it starts, not with every run
+# - Forked workers inherit the same random state, so every run seeds it from its own child seed
+#   and then creates its motion model, so no two runs start from the same velocities
+def init_worker(boundary: Boundary, motion_model: Callable[[], MotionModel]) -> None:
+    global my_boundary, my_motion_model
+    my_boundary, my_motion_model = boundary, motion_model
+
+
+def simulate(seed: np.random.SeedSequence) -> float:
+    np.random.seed(seed.generate_state(4))
 
     simulation = EvasionPathSimulation(boundary=my_boundary,
-                                       motion_model=my_motion_model,
+                                       motion_model=my_motion_model(),
                                        n_int_sensors=num_sensors,
                                        sensing_radius=sensing_radius,
                                        dt=timestep_size)
@@ -70,23 +90,28 @@ def simulate() -> float:
     return simulation.run()
 
 
-def output_data(filename: str, data_points: list) -> None:
-    with open(filename, 'a+') as file:
-        file.writelines("%.2f\n" % d for d in data_points)
+## Append each result to the file as it arrives.
+# data_points may be a generator, so results are written while other
+# simulations are still running.
+def output_data(filename: str, data_points: Iterable[float]) -> None:
+    with open(filename, 'a') as file:
+        for d in data_points:
+            file.write("%.2f\n" % d)
 
 
-def run_experiment() -> None:
-    times = Parallel(n_jobs=-1)(
-        delayed(simulate)() for _ in range(n_runs)
-    )
+def run_experiment(executor: ProcessPoolExecutor) -> None:
+    chunksize = max(1, n_runs // (4 * (os.cpu_count() or 1)))
+    seeds = np.random.SeedSequence().spawn(n_runs)
+    times = executor.map(simulate, seeds, chunksize=chunksize)
     output_data(output_dir + "/" + filename_base + ".txt", times)
 
 
 def main() -> None:
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
-    run_experiment()
+    # The workers are started once and reused by every experiment run in this block
+    with ProcessPoolExecutor(initializer=init_worker, initargs=(my_boundary, my_motion_model)) as executor:
+        run_experiment(executor)
 
 
 
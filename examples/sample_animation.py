@@ -12,6 +12,12 @@ import sys, os
 # src_dir = os.path.join(current_dir, "..", "src")
 # sys.path.append(src_dir)
 
+# Set HEADLESS=1 to render off-screen when only saving the animation, so no
+# GUI window is drawn alongside the encoder. Must be set before pyplot is imported.
+import matplotlib
+if os.environ.get("HEADLESS"):
+    matplotlib.use("Agg")
+
 from matplotlib.animation import FuncAnimation
 from evasionpaths.plotting_tools import *
 from evasionpaths.motion_model import *
@@ -81,32 +87,46 @@ class SimulationOver(Exception):
 output_dir: str = "./output"
 filename_base: str = "SampleAnimation"
 
+# Number of time steps taken between drawn frames. Increase to move through
+# the simulation faster while redrawing only once per frame.
+steps_per_frame: int = 1
+
+# The figure and the artists showing the state are created once, and update()
+# replaces their data each frame instead of clearing and redrawing the axis.
+fig = plt.figure(1)
+axis = plt.gca()
+axis.axis("off")
+axis.axis("equal")
+time_label = axis.text(0, 1, "", transform=axis.transAxes, va="top")
+state_artists = init_state_artists(simulation)
+
+
+# Return the artists to draw before the first frame
+def init():
+    return state_artists + (time_label,)
+
+
 # Update takes the frame number as an argument by default, other arguments
-# can be added by specifying fargs= ... in the FuncAnimation parameters
-def update(_):
+# can be added by specifying fargs= ... in the FuncAnimation parameters.
+# The log file is opened once in animate() and passed in with fargs.
+def update(_, log_file):
 
-    # Check is simulation is over
-    if not simulation.cycle_label.has_intruder():
-        raise SimulationOver
+    for _ in range(steps_per_frame):
 
-    # Update simulation
-    simulation.do_timestep()
-    simulation.time += simulation.dt
+        # Check is simulation is over
+        if not simulation.cycle_label.has_intruder():
+            raise SimulationOver
 
-    # Setup figure
-    axis = plt.gca()
-    axis.cla()
-    axis.axis("off")
-    axis.axis("equal")
-    title_str = "T = " + "{:5.2f}:\n".format(simulation.time)
-    axis.set_title(title_str, loc="left")
+        # Update simulation
+        simulation.do_timestep()
+        simulation.time += simulation.dt
 
-    # plot
-    show_state(simulation)
+        # log the steps that were taken
+        log_file.write("{0:5.2f} \n".format(simulation.time))
 
-    # log the steps that were taken
-    with open(output_dir + "/" + filename_base+".log", "a+") as file:
-        file.write("{0:5.2f} \n".format(simulation.time))
+    # Update plot data
+    time_label.set_text("T = " + "{:5.2f}:".format(simulation.time))
+    return update_state_artists(simulation, state_artists) + (time_label,)
 
 
 # Animation driver
@@ -118,15 +138,19 @@ def animate():
     # milliseconds per frame in resulting mp4 file
     ms_per_frame = 5000*timestep_size
 
-    fig = plt.figure(1)
-    try:
-        ani = FuncAnimation(fig, update, interval=ms_per_frame, frames=n_steps)
-    except SimulationOver:
-        print("Simulation Complete")
-    finally:
-        # uncomment below to show plot while computing
-        # plt.show()
-        ani.save(output_dir + "/" + filename_base+'.mp4')
+    with open(output_dir + "/" + filename_base+".log", "a") as log_file:
+
+        # Frames are drawn as they are computed, so there is no need to cache them
+        ani = FuncAnimation(fig, update, fargs=(log_file,), init_func=init, interval=ms_per_frame,
+                            frames=n_steps, blit=True, cache_frame_data=False)
+
+        # SimulationOver is raised from update() while the frames are being drawn
+        try:
+            # uncomment below to show plot while computing (not with HEADLESS)
+            # plt.show()
+            ani.save(output_dir + "/" + filename_base+'.mp4')
+        except SimulationOver:
+            print("Simulation Complete")
 
 
 
@@ -72,12 +72,9 @@ def simulate() -> float:
 
 
 def output_data(filename: str, data_points: list) -> None:
-    with open(filename, 'a+') as file:
-        for d in data_points:
-            if type(d) != str:
-                file.writelines("%.2f\n" % d)
-            else:
-                file.writelines(str(d) + "\n")
+    lines = [d + "\n" if isinstance(d, str) else "%.2f\n" % d for d in data_points]
+    with open(filename, 'a') as file:
+        file.write("".join(lines))
 
 
 def run_experiment() -> None:
@@ -87,8 +84,7 @@ def run_experiment() -> None:
 
 
 def main() -> None:
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
     run_experiment()
 
@@ -7,6 +7,7 @@ import os, sys
 
 from evasionpaths.time_stepping import *
 from joblib import Parallel, delayed
+from typing import Iterable
 
 ############################################################
 ## When running a simulation that will run for a long time, care must be taken to
@@ -65,7 +66,9 @@ filename_base: str = "data"
 # Run the simulation
 # - Unlike the animation, each simulation needs to create its own simulation object
 # - The number of simulations that will be run at one time is defined by n_jobs. n_jobs=-1 will run as many as possible. 
-def simulate() -> float:
+# - Each run seeds the random state from its own child seed, so runs on different workers never share a stream
+def simulate(seed: np.random.SeedSequence) -> float:
+    np.random.seed(seed.generate_state(4))
 
     simulation = EvasionPathSimulation(boundary=my_boundary,
                                        motion_model=my_motion_model,
@@ -96,26 +99,27 @@ def simulate() -> float:
     return data
 
 
-def output_data(filename: str, data_points: list) -> None:
-    with open(filename, 'a+') as file:
+## Append each result to the file as it arrives.
+# data_points may be a generator, so results are written while other
+# simulations are still running.
+def output_data(filename: str, data_points: Iterable) -> None:
+    with open(filename, 'a') as file:
         for d in data_points:
-            if type(d) != str:
-                file.writelines("%.2f\n" % d)
-            else:
-                file.writelines(str(d) + "\n")
+            file.write(d + "\n" if isinstance(d, str) else "%.2f\n" % d)
 
 
+# Results are returned as each simulation finishes (needs joblib>=1.4), so the lines
+# in the output file are in completion order, not the order the runs were submitted.
 def run_experiment() -> None:
-    times = Parallel(n_jobs=-1)(
-        delayed(simulate)() for _ in range(n_runs)
+    times = Parallel(n_jobs=-1, return_as="generator_unordered")(
+        delayed(simulate)(seed) for seed in np.random.SeedSequence().spawn(n_runs)
     )
     filename = output_dir + "/" + filename_base + ".txt"
     output_data(filename, times)
 
 
 def main() -> None:
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
     run_experiment()
 
@@ -37,6 +37,12 @@ class Boundary(ABC):
     def in_domain(self, point: tuple) -> bool:
         return True
 
+    ## Determine which of the given points are in the domain.
+    # Takes an (n, 2) array and returns a boolean array of length n. Checks
+    # each point with in_domain by default; override with a vectorized check.
+    def points_in_domain(self, points: np.ndarray) -> np.ndarray:
+        return np.array([self.in_domain(tuple(pt)) for pt in points], dtype=bool)
+
     ## Generate boundary points in counterclockwise order.
     # Points must be generated in counterclockwise order so that the
     # alpha_cycle can be easily computed.
@@ -113,14 +119,19 @@ class RectangularDomain(Boundary):
         return self.x_min <= point[0] <= self.x_max \
                and self.y_min <= point[1] <= self.y_max
 
+    ## Check all points against the domain at once.
+    def points_in_domain(self, points: np.ndarray) -> np.ndarray:
+        x, y = points[:, 0], points[:, 1]
+        return (self.x_min <= x) & (x <= self.x_max) & (self.y_min <= y) & (y <= self.y_max)
+
     ## Generate points in counter-clockwise order.
     def generate_boundary_points(self) -> list:
         points = []
         points.extend([(float(x), self.vy_min) for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # bottom
-        points.extend([(self.vx_max, float(y)) for y in np.arange(self.vy_min, 0.999*self.vx_max, self.spacing)])  # right
-        points.extend([(self.x_max - float(x), self.vy_max)
+        points.extend([(self.vx_max, float(y)) for y in np.arange(self.vy_min, 0.999*self.vy_max, self.spacing)])  # right
+        points.extend([(self.x_min + self.x_max - float(x), self.vy_max)
                        for x in np.arange(self.vx_min, 0.999*self.vx_max, self.spacing)])  # top
-        points.extend([(self.vx_min, self.y_max - float(y))
+        points.extend([(self.vx_min, self.y_min + self.y_max - float(y))
                        for y in np.arange(self.vy_min, 0.999*self.vy_max, self.spacing)])  # left
         return points
 
@@ -185,6 +196,10 @@ class CircularDomain(Boundary):
     def in_domain(self, point: tuple) -> bool:
         return norm(point) < self.radius
 
+    ## Check all points against the domain at once.
+    def points_in_domain(self, points: np.ndarray) -> np.ndarray:
+        return norm(points, axis=1) < self.radius
+
     ## Generate points in counter-clockwise order.
     def generate_boundary_points(self) -> list:
         return [(self.v_rad*math.cos(t), self.v_rad*math.sin(t)) for t in arange(0, 2 * pi, self.spacing)]
@@ -193,19 +208,23 @@ class CircularDomain(Boundary):
     def generate_interior_points(self, n_int_sensors):
         theta = np.random.uniform(0, 2 * pi, size=n_int_sensors)
         radius = np.random.uniform(0, self.radius, size=n_int_sensors)
-        return [(r*cos(t), r*sin(t)) for r, t in zip(radius, theta)]
+        return list(zip(radius*cos(theta), radius*sin(theta)))
 
     ## Generate Points to plot domain boundary.
     def domain_boundary_points(self):
-        x_pts = [self.radius*cos(t) for t in arange(0, 2*pi, 0.01)]
-        y_pts = [self.radius*sin(t) for t in arange(0, 2*pi, 0.01)]
-        return x_pts, y_pts
+        t = arange(0, 2*pi, 0.01)
+        return (self.radius*cos(t)).tolist(), (self.radius*sin(t)).tolist()
 
+    ## Find where the segment from old_pt to new_pt crosses the circle.
+    # Solves |x0 + t*d|^2 = radius^2 for t with the quadratic formula.
     def _get_intersection(self, old_pt, new_pt):
         d = new_pt - old_pt
         x0 = old_pt
-        t_vals = np.roots([norm(d)**2, 2*np.dot(d, x0), norm(x0)**2 - self.radius**2])
-        t = t_vals[0] if 0 <= t_vals[0] <= 1 else t_vals[1]
+        a, b, c = np.dot(d, d), 2*np.dot(d, x0), np.dot(x0, x0) - self.radius**2
+        sqrt_disc = math.sqrt(b*b - 4*a*c)
+        t = (-b - sqrt_disc) / (2*a)
+        if not 0 <= t <= 1:
+            t = (-b + sqrt_disc) / (2*a)
         return (1-t)*old_pt + t*new_pt
 
     ## reflect position if outside of domain.
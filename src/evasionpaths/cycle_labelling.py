@@ -54,9 +54,10 @@ class CycleLabelling:
     # the labelling, and added back when it becomes reconnected.
     def __init__(self, state: TopologicalState) -> None:
         self._cycle_label = dict()
+        self._n_intruder_cycles = 0
 
         for cycle in state.boundary_cycles():
-            self._cycle_label[cycle] = True
+            self._set_label(cycle, True)
         for cycle in [state.simplex2cycle(s) for s in state.simplices(2) if state.is_connected_simplex(s)]:
             self._add_2simplex(cycle)
         self._delete_all([cycle for cycle in self._cycle_label.keys() if not state.is_connected_cycle(cycle)])
@@ -83,26 +84,33 @@ class CycleLabelling:
         return value
 
     ## Check if any boundary cycles have an intruder.
+    # The number of cycles labelled TRUE is kept up to date by _set_label and
+    # _delete_all, so this does not need to scan the labelling.
     def has_intruder(self):
-        return any(self._cycle_label.values())
+        return self._n_intruder_cycles > 0
+
+    ## Set the label of a cycle, keeping count of the cycles labelled TRUE.
+    def _set_label(self, cycle, label):
+        self._n_intruder_cycles += label - self._cycle_label.get(cycle, False)
+        self._cycle_label[cycle] = label
 
     def _delete_all(self, cycle_list):
         for cycle in cycle_list:
-            del self._cycle_label[cycle]
+            self._n_intruder_cycles -= self._cycle_label.pop(cycle)
 
     def _add_1simplex(self, removed_cycles, added_cycles):
         for cycle in added_cycles:
-            self._cycle_label[cycle] = self._cycle_label[removed_cycles[0]]
+            self._set_label(cycle, self._cycle_label[removed_cycles[0]])
         self._delete_all(removed_cycles)
 
     def _remove_1simplex(self, removed_cycles, added_cycles):
         assert(len(added_cycles) == 1)
 
-        self._cycle_label[added_cycles[0]] = any([self._cycle_label[s] for s in removed_cycles])
+        self._set_label(added_cycles[0], any([self._cycle_label[s] for s in removed_cycles]))
         self._delete_all(removed_cycles)
 
     def _add_2simplex(self, added_simplex):
-        self._cycle_label[added_simplex] = False
+        self._set_label(added_simplex, False)
 
     def _add_simplex_pair(self, removed_cycles, added_cycles, added_simplex):
         self._add_1simplex(removed_cycles, added_cycles)
@@ -49,6 +49,18 @@ class MotionModel(ABC):
         return self.boundary.points \
             + [self.update_point(pt, n) for n, pt in enumerate(old_points) if n >= len(self.boundary)]
 
+    ## Reflect the non-fence points that have left the domain.
+    # Used by motion models that update all non-fence points at once. Takes
+    # the old and new non-fence points as (n, 2) arrays and returns the list
+    # of all points, fence included. The domain check is done for all points
+    # at once, and only the points outside are reflected one at a time.
+    def _reflect_interior(self, old_interior, new_interior) -> list:
+        offset = len(self.boundary)
+        new_points = list(map(tuple, new_interior.tolist()))
+        for n in np.flatnonzero(~self.boundary.points_in_domain(new_interior)).tolist():
+            new_points[n] = self.reflect(tuple(old_interior[n].tolist()), new_points[n], n + offset)
+        return self.boundary.points + new_points
+
 
 ## Provide random motion for rectangular domain.
 # Will move a point randomly with an average step
@@ -69,6 +81,17 @@ class BrownianMotion(MotionModel):
         new_pt = old_pt[0] + self.epsilon(), old_pt[1] + self.epsilon()
         return new_pt if self.boundary.in_domain(new_pt) else self.reflect(old_pt, new_pt, sensor_id)
 
+    ## Update all non-fence points with a single random draw.
+    # The noise for every interior sensor is drawn at once rather than
+    # calling epsilon() twice per sensor; update_point is kept for
+    # point-wise use.
+    def update_points(self, old_points: list, dt: float) -> list:
+        self.dt = dt
+        offset = len(self.boundary)
+        old_interior = array(old_points[offset:], dtype=float).reshape(-1, 2)
+        new_interior = old_interior + random.normal(0, self.sigma * sqrt(self.dt), size=old_interior.shape)
+        return self._reflect_interior(old_interior, new_interior)
+
     def reflect(self, old_pt, new_pt, sensor_id):
         return self.boundary.reflect_point(old_pt, new_pt)
 
@@ -93,6 +116,17 @@ class BilliardMotion(MotionModel):
         new_pt = (pt[0] + self.dt * self.vel * np.cos(theta)), (pt[1] + self.dt * self.vel * np.sin(theta))
         return new_pt if self.boundary.in_domain(new_pt) else self.reflect(pt, new_pt, sensor_id)
 
+    ## Update all non-fence points at once using x = x + v*dt.
+    # Only the points that leave the domain are reflected one at a time;
+    # update_point is kept for point-wise use.
+    def update_points(self, old_points: list, dt: float) -> list:
+        self.dt = dt
+        offset = len(self.boundary)
+        theta = array(self.vel_angle[offset:len(old_points)])
+        old_interior = array(old_points[offset:], dtype=float).reshape(-1, 2)
+        new_interior = old_interior + self.dt * self.vel * np.column_stack((np.cos(theta), np.sin(theta)))
+        return self._reflect_interior(old_interior, new_interior)
+
     def reflect(self, old_pt, new_pt, sensor_id):
         self.vel_angle[sensor_id] = self.boundary.reflect_velocity(old_pt, new_pt)
         return self.boundary.reflect_point(old_pt, new_pt)
@@ -110,6 +144,14 @@ class RunAndTumble(BilliardMotion):
             self.vel_angle[sensor_id] = random.uniform(0, 2 * pi)
         return super().update_point(pt, sensor_id)
 
+    ## Update angles of all non-fence points, then update as normal.
+    def update_points(self, old_points: list, dt: float) -> list:
+        offset = len(self.boundary)
+        tumble = random.randint(0, 5, size=len(old_points) - offset) == 4
+        for sensor_id, theta in zip(offset + np.flatnonzero(tumble), random.uniform(0, 2 * pi, tumble.sum())):
+            self.vel_angle[sensor_id] = float(theta)
+        return super().update_points(old_points, dt)
+
 
 class Viscek(BilliardMotion):
 
@@ -122,25 +164,27 @@ class Viscek(BilliardMotion):
     def dist(pt1, pt2):
         return norm(array(pt1) - array(pt2))
 
-    def eta(self):
-        return (pi / 12) * random.uniform(-1, 1)
+    def eta(self, size=None):
+        return (pi / 12) * random.uniform(-1, 1, size)
 
+    ## Update points, then align each velocity with its neighbours.
+    # Neighbours are found for all sensors at once, but the headings are still
+    # updated in place one sensor after another, so each sensor sees the new
+    # headings of the sensors aligned before it.
     def update_points(self, old_points: list, dt: float) -> list:
-        self.dt = dt
         offset = len(self.boundary)
-
-        new_points = self.boundary.points \
-                     + [self.update_point(pt, offset + n) for n, pt in enumerate(old_points[offset:])]
+        new_points = super().update_points(old_points, dt)
 
         if self.dt != self.large_dt:
             return new_points
 
-        for i, pti in enumerate(old_points[offset:]):
-            index_list = [j for j, ptj in enumerate(old_points[offset:]) if self.dist(pti, ptj) < self.radius]
-
-            if index_list:
-                self.vel_angle[i + offset] = float(
-                    mean([self.vel_angle[j + offset] for j in index_list]) + self.eta()) % (2 * pi)
+        interior = array(old_points[offset:], dtype=float).reshape(-1, 2)
+        neighbors = norm(interior[:, None, :] - interior[None, :, :], axis=2) < self.radius
+        headings = array(self.vel_angle[offset:])
+        noise = self.eta(len(headings))
+        for i, index_list in enumerate(neighbors):
+            headings[i] = float(mean(headings[index_list]) + noise[i]) % (2 * pi)
+        self.vel_angle[offset:] = headings.tolist()
 
         return new_points
 
@@ -162,36 +206,42 @@ class Dorsogna(MotionModel):
         return pt
 
     def reflect(self, old_pt, new_pt, index) -> tuple:
-        norm_v = norm(self.velocities[index])
+        norm_v = math.hypot(*self.velocities[index])
         theta = self.boundary.reflect_velocity(old_pt, new_pt)
-        self.velocities[index] = (norm_v * cos(theta), norm_v * sin(theta))
+        self.velocities[index] = (norm_v * math.cos(theta), norm_v * math.sin(theta))
         return self.boundary.reflect_point(old_pt, new_pt)
 
     def gradient(self, xs, ys):
-        gradUx, gradUy = [0.0] * self.n_sensors, [0.0] * self.n_sensors
-
-        for i in range(0, self.n_sensors):
-            for j in range(self.n_sensors):
-                r = norm((xs[i] - xs[j], ys[i] - ys[j]))
-                if 0.0 < r < 2 * self.sensing_radius:
-                    attract_term = (self.DO_coeff["Ca"] * np.exp(-r / self.DO_coeff["la"]) / (self.DO_coeff["la"] * r))
-                    repel_term = (self.DO_coeff["Cr"] * np.exp(-r / self.DO_coeff["lr"]) / (self.DO_coeff["lr"] * r))
-
-                    gradUx[i] += (xs[i] - xs[j]) * attract_term - (xs[i] - xs[j]) * repel_term
-                    gradUy[i] += (ys[i] - ys[j]) * attract_term - (ys[i] - ys[j]) * repel_term
+        n_sensors = self.n_sensors
+        Ca, la, Cr, lr = (self.DO_coeff[k] for k in ("Ca", "la", "Cr", "lr"))
+        cutoff2 = (2 * self.sensing_radius) ** 2
+        gradUx, gradUy = [0.0] * n_sensors, [0.0] * n_sensors
+
+        for i in range(0, n_sensors):
+            for j in range(n_sensors):
+                dx, dy = xs[i] - xs[j], ys[i] - ys[j]
+                r2 = dx * dx + dy * dy
+                if 0.0 < r2 < cutoff2:
+                    r = math.sqrt(r2)
+                    attract_term = Ca * math.exp(-r / la) / (la * r)
+                    repel_term = Cr * math.exp(-r / lr) / (lr * r)
+
+                    gradUx[i] += dx * attract_term - dx * repel_term
+                    gradUy[i] += dy * attract_term - dy * repel_term
 
         return array(gradUx), array(gradUy)
 
     def time_derivative(self, _, state):
         # ode solver gives us np array in the form [xvals | yvals | vxvals | vyvals]
         # split into individual np array
-        split_state = [state[i:i + self.n_sensors] for i in range(0, len(state), self.n_sensors)]
-        gradU = self.gradient(split_state[0], split_state[1])
+        n = self.n_sensors
+        xs, ys, vxs, vys = state[:n], state[n:2 * n], state[2 * n:3 * n], state[3 * n:]
+        gradU = self.gradient(xs, ys)
 
         # Need to compute time derivative of each,
         # I just have d(x, y)/dt = (vx, vy), d(vx, vy)/dt = (1, -1)
-        dxdt = split_state[2]
-        dydt = split_state[3]
+        dxdt = vxs
+        dydt = vys
         dvxdt = array(self.n_sensors * [0])
         dvydt = array(self.n_sensors * [0])
         for i in range(self.n_sensors):
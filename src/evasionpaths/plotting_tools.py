@@ -9,29 +9,25 @@
 from evasionpaths.time_stepping import *
 from evasionpaths.motion_model import *
 import matplotlib.pyplot as plt
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
 
 
 def get_graph(sim):
     """ This function is to access the combinatorial map externally primarily
         this function is meant to help with plotting and not to be used internally"""
-    from gudhi import AlphaComplex
-    alpha_complex = AlphaComplex(sim.points)
-    simplex_tree = alpha_complex.create_simplex_tree(max_alpha_square=sim.sensing_radius ** 2)
-
-    simplices1 = [tuple(simplex) for simplex, _ in simplex_tree.get_skeleton(1) if len(simplex) == 2]
-
+    # sim.state is always computed from sim.points, so reuse its 1-simplices
+    # rather than building the same alpha complex again
     graph = nx.Graph()
     graph.add_nodes_from(range(len(sim.points)))
-    graph.add_edges_from(simplices1)
+    graph.add_edges_from(sim.state.simplices(1))
 
     return graph
 
 
 def show_boundary_points(sim):
     axis = plt.gca()
-    xpts = [x for x, _ in sim.boundary.points]
-    ypts = [y for _, y in sim.boundary.points]
-    axis.plot(xpts, ypts, "k*")
+    pts = np.asarray(sim.boundary.points)
+    axis.plot(pts[:, 0], pts[:, 1], "k*")
 
 
 def show_domain_boundary(sim):
@@ -49,57 +45,63 @@ def show_labelled_graph(sim):
 
 def show_sensor_points(sim):
     axis = plt.gca()
-    xpts = [x for x, _ in sim.points]
-    ypts = [y for _, y in sim.points]
-    axis.plot(xpts, ypts, "k*")
+    pts = np.asarray(sim.points)
+    axis.plot(pts[:, 0], pts[:, 1], "k*")
     return
 
 
+## Draw the sensing disks as a single collection sized in data units.
+# The collection is returned so its offsets can be updated in place.
 def show_sensor_radius(sim):
     axis = plt.gca()
-    for pt in sim.points:
-        axis.add_artist(plt.Circle(pt, sim.sensing_radius, color='b', alpha=0.1, clip_on=False))
+    diameter = 2 * sim.sensing_radius
+    return axis.add_collection(EllipseCollection(diameter, diameter, 0, units='xy', offsets=np.asarray(sim.points),
+                                                 offset_transform=axis.transData,
+                                                 color='b', alpha=0.1, clip_on=False))
+
+
+## Vertices of the boundary cycles that may contain an intruder.
+def _intruder_polygons(sim, pts):
+    polygons = []
+    alpha_nodes = set(cycle2nodes(sim.boundary.alpha_cycle))
+    boundary_cycles = sim.state.boundary_cycles()
+    for cycle_nodes in CMap(get_graph(sim), sim.points).boundary_cycle_nodes_ordered():
+        if set(cycle_nodes) == alpha_nodes:
+            continue
+        cycle = nodes2cycle(cycle_nodes, boundary_cycles)
+        if cycle in sim.cycle_label and sim.cycle_label[cycle]:
+            polygons.append(pts[list(cycle_nodes)])
+    return polygons
 
 
+## Fill the boundary cycles that may contain an intruder.
 def show_possible_intruder(sim):
     axis = plt.gca()
-    graph = get_graph(sim)
-    cmap = CMap(graph, sim.points)
+    for polygon in _intruder_polygons(sim, np.asarray(sim.points)):
+        axis.fill(polygon[:, 0], polygon[:, 1], color='k', alpha=0.2)
+    show_sensor_points(sim)
 
-    for cycle_nodes in cmap.boundary_cycle_nodes_ordered():
-        xpts = [sim.points[n][0] for n in cycle_nodes]
-        ypts = [sim.points[n][1] for n in cycle_nodes]
-        if set(cycle_nodes) == set(cycle2nodes(sim.boundary.alpha_cycle)):
-            continue
 
-        cycle = nodes2cycle(cycle_nodes, sim.state.boundary_cycles())
-        if cycle == sim.boundary.alpha_cycle:
-            axis.fill(xpts, ypts, color='k', alpha=0.2)
+## Vertices of the labelled 2-simplices as an (n, 3, 2) array.
+def _simplex_vertices(sim, pts):
+    simplices = [simplex for simplex in sim.state.simplices(2)
+                 if nodes2cycle(simplex, sim.state.boundary_cycles()) in sim.cycle_label]
+    return pts[np.array(simplices, dtype=int).reshape(-1, 3)]
 
-        if cycle not in sim.cycle_label:
-            continue
 
-        if sim.cycle_label[nodes2cycle(cycle_nodes, sim.state.boundary_cycles())]:
-            axis.fill(xpts, ypts, color='k', alpha=0.2)
-        else:
-            pass
-    show_sensor_points(sim)
+## End points of the 1-simplices as an (n, 2, 2) array.
+def _edge_segments(sim, pts):
+    return pts[np.array(sim.state.simplices(1), dtype=int).reshape(-1, 2)]
 
 
+## Draw the labelled 2-simplices and the 1-simplices as one collection each.
 def show_alpha_complex(sim):
 
     axis = plt.gca()
+    pts = np.asarray(sim.points)
 
-    for simplex in sim.state.simplices(2):
-        xpts = [sim.points[n][0] for n in simplex]
-        ypts = [sim.points[n][1] for n in simplex]
-        if nodes2cycle(simplex, sim.state.boundary_cycles()) in sim.cycle_label:
-            axis.fill(xpts, ypts, color='r', alpha=0.1)
-
-    for edge in sim.state.simplices(1):
-        xpts = [sim.points[n][0] for n in edge]
-        ypts = [sim.points[n][1] for n in edge]
-        axis.plot(xpts, ypts, color='r', alpha=0.15)
+    axis.add_collection(PolyCollection(_simplex_vertices(sim, pts), color='r', alpha=0.1))
+    axis.add_collection(LineCollection(_edge_segments(sim, pts), colors='r', alpha=0.15))
 
     show_sensor_points(sim)
 
@@ -110,6 +112,39 @@ def show_state(sim):
     show_alpha_complex(sim)
 
 
+## Create the artists used to draw the state of a simulation.
+# The artists are created once and updated in place with update_state_artists,
+# so an animation does not have to clear and redraw the axis every frame.
+def init_state_artists(sim):
+    axis = plt.gca()
+    intruder_cycles = axis.add_collection(PolyCollection([], color='k', alpha=0.2))
+    simplices = axis.add_collection(PolyCollection([], color='r', alpha=0.1))
+    edges = axis.add_collection(LineCollection([], colors='r', alpha=0.15))
+    sensor_radius = show_sensor_radius(sim)
+    sensor_points, = axis.plot([], [], "k*")
+
+    # Collections do not update the data limits, so fit the view to the sensing disks
+    pts = np.asarray(sim.points)
+    axis.update_datalim(np.vstack([pts - sim.sensing_radius, pts + sim.sensing_radius]))
+    axis.autoscale_view()
+
+    return update_state_artists(sim, (intruder_cycles, simplices, edges, sensor_radius, sensor_points))
+
+
+## Update the artists created by init_state_artists to the current state.
+# Returns the artists so it can be used directly as a FuncAnimation callback.
+def update_state_artists(sim, artists):
+    intruder_cycles, simplices, edges, sensor_radius, sensor_points = artists
+    pts = np.asarray(sim.points)
+
+    intruder_cycles.set_verts(_intruder_polygons(sim, pts))
+    simplices.set_verts(_simplex_vertices(sim, pts))
+    edges.set_segments(_edge_segments(sim, pts))
+    sensor_radius.set_offsets(pts)
+    sensor_points.set_data(pts[:, 0], pts[:, 1])
+    return artists
+
+
 def show_combinatorial_map(sim):
     graph = get_graph(sim)
     temp_dict = {edge: edge2dart(edge) for edge in graph.edges}
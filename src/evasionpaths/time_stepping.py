@@ -6,6 +6,7 @@
 # If not, visit: https://opensource.org/licenses/BSD-3-Clause
 # ************************************************************
 import pickle
+import time
 from evasionpaths.cycle_labelling import *
 from evasionpaths.topological_state import *
 from evasionpaths.motion_model import *
@@ -26,6 +27,17 @@ class MaxRecursionDepth(Exception):
                + str(self.state_change)
 
 
+## Exception indicating that a simulation ran longer than allowed.
+# Raised by EvasionPathSimulation.run() when a wall-clock timeout is given
+# and exceeded. The simulation time reached is kept for reporting.
+class TimedOut(Exception):
+    def __init__(self, sim_time):
+        self.sim_time = sim_time
+
+    def __str__(self):
+        return "Timed out at simulation time " + str(self.sim_time)
+
+
 ## This class provides the main interface for running a simulation.
 # It provides the ability to preform a single timestep manually, run
 # until there are no possible intruders, or until a max time is reached.
@@ -55,7 +67,7 @@ class EvasionPathSimulation:
         if not points:
             self.points = boundary.generate_points(n_int_sensors)
         else:
-            self.points = boundary.generate_boundary_points() + points
+            self.points = boundary.points + points
             if motion_model.n_sensors:
                 assert motion_model.n_sensors == len(points), \
                     "motion_model.n_sensors != len(points) \n"\
@@ -65,13 +77,21 @@ class EvasionPathSimulation:
         self.cycle_label = CycleLabelling(self.state)
 
     ## Run until no more intruders.
-    # exit if max time is set. Returns simulation time.
-    def run(self) -> float:
+    # exit if max time is set. Returns simulation time. If timeout is set to a
+    # non-zero number of seconds, raise TimedOut once the run has taken longer
+    # than that in wall-clock time. The deadline is only checked between time
+    # steps, so a single step that never returns is not interrupted; use a
+    # wall-clock limit on the calling process if that has to be caught, as
+    # examples/max_simulation_time.py does.
+    def run(self, timeout: float = 0) -> float:
+        deadline = time.monotonic() + timeout
         while self.cycle_label.has_intruder():
             self.time += self.dt
             self.do_timestep()
             if 0 < self.Tend < self.time:
                 break
+            if timeout and time.monotonic() > deadline:
+                raise TimedOut(self.time)
         return self.time
 
     ## To single timestep.
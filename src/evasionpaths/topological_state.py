@@ -31,10 +31,11 @@ class TopologicalState(object):
         alpha_complex = AlphaComplex(points)
         simplex_tree = alpha_complex.create_simplex_tree(max_alpha_square=sensing_radius ** 2)
 
+        # Walk the simplex tree once and sort the simplices by dimension
         self._simplices = [[], [], []]
-        self._simplices[0] = [simplex[0] for simplex, _ in simplex_tree.get_skeleton(0)]
-        self._simplices[1] = [tuple(simplex) for simplex, _ in simplex_tree.get_skeleton(1) if len(simplex) == 2]
-        self._simplices[2] = [tuple(simplex) for simplex, _ in simplex_tree.get_skeleton(2) if len(simplex) == 3]
+        for simplex, _ in simplex_tree.get_skeleton(2):
+            self._simplices[len(simplex) - 1].append(tuple(simplex))
+        self._simplices[0] = [simplex[0] for simplex in self._simplices[0]]
 
         graph = nx.Graph()
         graph.add_nodes_from(self._simplices[0])
@@ -44,6 +45,7 @@ class TopologicalState(object):
         self._boundary_cycles.remove(boundary.alpha_cycle)
 
         self._connected_nodes = nx.node_connected_component(graph, 0)
+        self._cycle_index = None
 
     ## Check if graph is connected.
     # This is used for flagging when the graph has become disconnected.
@@ -89,10 +91,17 @@ class TopologicalState(object):
     # alpha complex into the combinatorial map. For example, if a 2-simplex is added, but
     # no boundary cycles are changed, we have no other was of identifying which boundary
     # cycle label should be updated.
+    #
+    # The boundary cycles are indexed by their set of nodes the first time this is called,
+    # keeping the first cycle for each set of nodes to match nodes2cycle.
     def simplex2cycle(self, simplex):
         if len(simplex) != 3 or not self.is_connected_simplex(simplex):
             raise ValueError("Invalid simplex, cannot guarantee unique cycle")
-        return nodes2cycle(simplex, self._boundary_cycles)
+        if self._cycle_index is None:
+            self._cycle_index = dict()
+            for cycle in self._boundary_cycles:
+                self._cycle_index.setdefault(frozenset(cycle2nodes(cycle)), cycle)
+        return self._cycle_index.get(frozenset(simplex))
 
 
 ## This class is used to determine and represent the differences between two states.
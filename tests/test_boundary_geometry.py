@@ -0,0 +1,95 @@
+# ************************************************************
+# Copyright (c) 2020, Kyle Williams - All Rights Reserved.
+# You may use, distribute and modify this code under the
+# terms of the BSD-3 license. You should have received a copy
+# of the BSD-3 license with this file.
+# If not, visit: https://opensource.org/licenses/BSD-3-Clause
+# ************************************************************
+
+import math
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from evasionpaths.boundary_geometry import *
+
+
+class TestRectangularFence(TestCase):
+    # Offset, non-square domain so that errors mixing up x_min/x_max or
+    # x/y bounds show up in the fence.
+    def setUp(self) -> None:
+        self.domain = RectangularDomain(spacing=0.2, x_min=1, x_max=3, y_min=-1, y_max=2)
+        self.points = self.domain.generate_boundary_points()
+
+    def test_points_on_virtual_rectangle(self):
+        d = self.domain
+        for x, y in self.points:
+            with self.subTest(point=(x, y)):
+                self.assertTrue(d.vx_min - 1e-9 <= x <= d.vx_max + 1e-9)
+                self.assertTrue(d.vy_min - 1e-9 <= y <= d.vy_max + 1e-9)
+                on_side = any(math.isclose(a, b, abs_tol=1e-9)
+                              for a, b in [(x, d.vx_min), (x, d.vx_max), (y, d.vy_min), (y, d.vy_max)])
+                self.assertTrue(on_side)
+
+    def test_fence_surrounds_domain(self):
+        d = self.domain
+        xs = [x for x, _ in self.points]
+        ys = [y for _, y in self.points]
+        self.assertAlmostEqual(min(xs), d.vx_min)
+        self.assertAlmostEqual(max(xs), d.vx_max)
+        self.assertAlmostEqual(min(ys), d.vy_min)
+        self.assertAlmostEqual(max(ys), d.vy_max)
+
+    def test_no_repeated_points(self):
+        rounded = {(round(x, 9), round(y, 9)) for x, y in self.points}
+        self.assertEqual(len(rounded), len(self.points))
+
+    def test_counter_clockwise(self):
+        d = self.domain
+        cx, cy = (d.x_min + d.x_max) / 2, (d.y_min + d.y_max) / 2
+        start = math.atan2(self.points[0][1] - cy, self.points[0][0] - cx)
+        angles = [(math.atan2(y - cy, x - cx) - start) % (2 * math.pi) for x, y in self.points]
+        for a, b in zip(angles, angles[1:]):
+            self.assertLess(a, b)
+
+
+class TestPointsInDomain(TestCase):
+    # The vectorized check must agree with in_domain point by point,
+    # including points exactly on the boundary.
+    def assertMatchesInDomain(self, domain, points):
+        points = np.array(points, dtype=float)
+        expected = [domain.in_domain(tuple(p)) for p in points]
+        self.assertEqual(list(domain.points_in_domain(points)), expected)
+
+    def test_rectangle(self):
+        domain = RectangularDomain(spacing=0.2)
+        self.assertMatchesInDomain(domain, [(0.5, 0.5), (0, 0), (1, 1), (0, 1), (1, 0),
+                                            (0.5, 0), (0.5, 1), (0, 0.5), (1, 0.5),
+                                            (-0.01, 0.5), (1.01, 0.5), (0.5, -0.01), (0.5, 1.01),
+                                            (-1, -1), (2, 2)])
+
+    def test_offset_rectangle(self):
+        domain = RectangularDomain(spacing=0.2, x_min=1, x_max=3, y_min=-1, y_max=2)
+        self.assertMatchesInDomain(domain, [(2, 0.5), (1, -1), (3, 2), (1, 2), (3, -1),
+                                            (2, -1), (2, 2), (1, 0), (3, 0),
+                                            (0.5, 0.5), (2, -1.5), (3.5, 0), (2, 2.5), (0, 0)])
+
+    def test_circle(self):
+        domain = CircularDomain(spacing=0.2, radius=1)
+        self.assertMatchesInDomain(domain, [(0, 0), (0.5, 0.5), (1, 0), (0, -1), (-1, 0), (0, 1),
+                                            (0.6, 0.8), (-0.6, -0.8), (0.99, 0), (1.01, 0),
+                                            (0.8, 0.8), (2, 2)])
+
+    def test_random_points(self):
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-2, 4, size=(200, 2))
+        for domain in [RectangularDomain(spacing=0.2),
+                       RectangularDomain(spacing=0.2, x_min=1, x_max=3, y_min=-1, y_max=2),
+                       CircularDomain(spacing=0.2, radius=1)]:
+            with self.subTest(domain=type(domain).__name__):
+                self.assertMatchesInDomain(domain, points)
+
+
+if __name__ == '__main__':
+    unittest.main()
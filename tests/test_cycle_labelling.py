@@ -9,17 +9,18 @@
 import unittest
 from unittest import TestCase
 
-from cycle_labelling import *
+from evasionpaths.cycle_labelling import *
 
 
 class TopologicalState:
-    @classmethod
-    def boundary_cycles(cls):
-        return []
+    def __init__(self, cycles=(), simplices2=()):
+        self.cycles, self.simplices2 = list(cycles), list(simplices2)
 
-    @classmethod
-    def simplices(cls, dim):
-        return []
+    def boundary_cycles(self):
+        return self.cycles
+
+    def simplices(self, dim):
+        return self.simplices2 if dim == 2 else []
 
     @classmethod
     def simplex2cycle(cls, simplex):
@@ -44,42 +45,46 @@ class TestRemoveEdge(TestCase):
         self.removed_cycles = ["A", "B"]
         self.added_cycles = ["AA"]
 
+    def set_labels(self, labels):
+        for cycle, label in labels.items():
+            self.cycle_labelling._set_label(cycle, label)
+
     def test_adds_bcycles(self):
-        self.cycle_labelling._cycle_label = {"A": True, "B": True}
+        self.set_labels({"A": True, "B": True})
         self.cycle_labelling._remove_1simplex(self.removed_cycles, self.added_cycles)
         self.assertIn("AA", self.cycle_labelling)
 
     def tests_removes_bcycles(self):
-        self.cycle_labelling._cycle_label = {"A": True, "B": True}
+        self.set_labels({"A": True, "B": True})
         self.cycle_labelling._remove_1simplex(self.removed_cycles, self.added_cycles)
         self.assertNotIn("A", self.cycle_labelling)
         self.assertNotIn("B", self.cycle_labelling)
 
     def test_joins_clear_clear(self):
-        self.cycle_labelling._cycle_label = {"A": True, "B": True}
+        self.set_labels({"A": True, "B": True})
         self.cycle_labelling._remove_1simplex(self.removed_cycles, self.added_cycles)
         self.assertEqual(self.cycle_labelling["AA"], True)
 
     def test_joins_clear_contaminated(self):
-        self.cycle_labelling._cycle_label = {"A": True, "B": False}
+        self.set_labels({"A": True, "B": False})
         self.cycle_labelling._remove_1simplex(self.removed_cycles, self.added_cycles)
         self.assertEqual(self.cycle_labelling["AA"], True)
 
     def test_joins_contaminated_contaminated(self):
-        self.cycle_labelling._cycle_label = {"A": False, "B": False}
+        self.set_labels({"A": False, "B": False})
         self.cycle_labelling._remove_1simplex(self.removed_cycles, self.added_cycles)
         self.assertEqual(self.cycle_labelling["AA"], False)
 
     def test_cannot_add_mult_bcycles(self):
         added_cycles = self.added_cycles + ["BB"]
-        self.cycle_labelling._cycle_label = {"A": False, "B": False}
+        self.set_labels({"A": False, "B": False})
 
         with self.assertRaises(AssertionError):
             self.cycle_labelling._remove_1simplex(self.removed_cycles, added_cycles)
 
     def test_allow_remove_mult_bycycles(self):
         removed_cycles = self.removed_cycles + ["C"]
-        self.cycle_labelling._cycle_label = {"A": False, "B": False}
+        self.set_labels({"A": False, "B": False})
 
         try:
             self.cycle_labelling._remove_1simplex(removed_cycles, self.added_cycles)
@@ -112,3 +117,65 @@ class TestAddEdge(TestCase):
         self.fail()
 
 
+## has_intruder() uses a count of the cycles labelled True, which must match the labelling
+# after every update.
+class TestHasIntruder(TestCase):
+    def setUp(self) -> None:
+        self.cycle_labelling = CycleLabelling(TopologicalState())
+        for cycle, label in {"A": True, "B": False, "C": False}.items():
+            self.cycle_labelling._set_label(cycle, label)
+
+    def assertMatchesLabels(self, expected):
+        self.assertEqual(self.cycle_labelling.has_intruder(), any(self.cycle_labelling._cycle_label.values()))
+        self.assertEqual(self.cycle_labelling.has_intruder(), expected)
+
+    def test_initial_labelling(self):
+        self.assertMatchesLabels(True)
+        self.cycle_labelling = CycleLabelling(TopologicalState(["A", "B", "C"], ["C"]))
+        self.assertMatchesLabels(True)
+        self.cycle_labelling = CycleLabelling(TopologicalState(["A", "B"], ["A", "B"]))
+        self.assertMatchesLabels(False)
+
+    def test_relabel_same_value(self):
+        self.cycle_labelling._set_label("A", True)
+        self.cycle_labelling._set_label("A", True)
+        self.cycle_labelling._add_2simplex("A")
+        self.assertMatchesLabels(False)
+
+    def test_add_1simplex(self):
+        self.cycle_labelling._add_1simplex(["A"], ["AA", "AB"])
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._add_2simplex("AA")
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._add_2simplex("AB")
+        self.assertMatchesLabels(False)
+
+    def test_remove_1simplex(self):
+        self.cycle_labelling._remove_1simplex(["B", "C"], ["BC"])
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._remove_1simplex(["A", "BC"], ["ABC"])
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._add_2simplex("ABC")
+        self.assertMatchesLabels(False)
+
+    def test_add_and_remove_simplex_pair(self):
+        self.cycle_labelling._add_simplex_pair(["A"], ["AA", "AB"], "AA")
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._remove_simplex_pair(["AA", "AB"], ["A"])
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._add_simplex_pair(["B"], ["BA", "BB"], "BA")
+        self.assertMatchesLabels(True)
+
+    def test_delaunay_flip(self):
+        self.cycle_labelling._delaunay_flip(["A", "B"], ["D", "E"])
+        self.assertMatchesLabels(False)
+
+    def test_disconnect_and_reconnect(self):
+        self.cycle_labelling._disconnect(["A", "B"], "E")
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._reconnect(["A", "B"], "E", ["B"])
+        self.assertMatchesLabels(True)
+        self.cycle_labelling._add_2simplex("A")
+        self.assertMatchesLabels(False)
+        self.cycle_labelling._disconnect(["A", "B"], "E")
+        self.assertMatchesLabels(False)
@@ -8,11 +8,37 @@
 
 import unittest
 
+import numpy as np
+
+from evasionpaths.time_stepping import *
+
 
 class MyTestCase(unittest.TestCase):
     def test_something(self):
         self.assertEqual(True, False)
 
 
+## Three sensors cannot cover the unit square, so every run starts with an intruder.
+class TestRunTimeout(unittest.TestCase):
+    def setUp(self) -> None:
+        np.random.seed(0)
+        boundary = RectangularDomain(spacing=0.2)
+        motion_model = BilliardMotion(dt=0.01, boundary=boundary, vel=1, n_int_sensors=3)
+        self.simulation = EvasionPathSimulation(boundary=boundary, motion_model=motion_model, n_int_sensors=3,
+                                                sensing_radius=0.2, dt=0.01, end_time=0.05)
+
+    def test_tiny_timeout_raises(self):
+        with self.assertRaises(TimedOut) as context:
+            self.simulation.run(timeout=1e-9)
+        self.assertEqual(context.exception.sim_time, self.simulation.time)
+        self.assertEqual(self.simulation.time, self.simulation.dt)
+
+    def test_no_timeout_runs_to_completion(self):
+        self.assertGreater(self.simulation.run(timeout=0), 0.05)
+
+    def test_generous_timeout_runs_to_completion(self):
+        self.assertGreater(self.simulation.run(timeout=600), 0.05)
+
+
 if __name__ == '__main__':
     unittest.main()